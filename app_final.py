@@ -1,5 +1,13 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
+import numpy as np
+import altair as alt
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
 import matplotlib.pyplot as plt
 
 # -----------------------------
@@ -17,16 +25,93 @@ st.title("CloudMart Dashboard")
 # -----------------------------
 st.sidebar.header("Upload CSV File (Optional)")
 uploaded_file = st.sidebar.file_uploader("Choose a CSV file", type=["csv"])
+
+PARALLEL_CLEAN_MIN_ROWS = 100_000
+
+# Known schema handed to the parser so these columns skip type inference.
+# Low-cardinality labels are read straight into categoricals so filters and
+# groupbys work on integer codes
+CSV_DTYPES = {
+    'MonthlyCostUSD': 'float64',
+    'Tagged': 'category',
+    'Service': 'category',
+    'Region': 'category',
+    'Department': 'category',
+    'Project': 'category',
+    'Environment': 'category',
+    'AccountID': 'category',
+    'ResourceID': 'string',
+}
+
+tag_fields = ['Department','Project','Owner']
+
+def read_csv(source, dtype=CSV_DTYPES):
+    # Prefer the PyArrow parser (Arrow-backed columns on pandas 2+), fall back to the C engine
+    try:
+        if int(pd.__version__.split('.')[0]) >= 2:
+            # Plain 'string' would be Python-backed; match the backend's Arrow strings
+            dtype = {col: pd.ArrowDtype(pa.string()) if t == 'string' else t for col, t in dtype.items()}
+            return pd.read_csv(source, engine="pyarrow", dtype=dtype, dtype_backend="pyarrow")
+        return pd.read_csv(source, engine="pyarrow", dtype=dtype)
+    except (ImportError, ValueError):
+        if hasattr(source, "seek"):
+            source.seek(0)
+        # low_memory is not supported by the PyArrow engine
+        return pd.read_csv(source, engine="c", dtype=dtype, low_memory=False, cache_dates=True)
+
+@st.cache_data
+def load_df(file_or_path):
+    # Bytes from an upload are hashed by content, so re-uploads of the same file hit the cache
+    if isinstance(file_or_path, bytes):
+        file_or_path = io.BytesIO(file_or_path)
+    try:
+        df = read_csv(file_or_path)
+    except ValueError:
+        # Non-numeric costs in an uploaded file: read the column untyped and coerce it below
+        if hasattr(file_or_path, "seek"):
+            file_or_path.seek(0)
+        df = read_csv(file_or_path, dtype={col: dtype for col, dtype in CSV_DTYPES.items() if col != 'MonthlyCostUSD'})
+
+    # Clean dataset
+    df.columns = df.columns.str.strip().str.replace('"', '', regex=False)
+    # Entirely blank columns come back as null[pyarrow]; treat them as (empty) strings
+    for col in df.columns:
+        if getattr(df[col].dtype, 'pyarrow_dtype', None) == pa.null():
+            df[col] = df[col].astype(pd.ArrowDtype(pa.string()))
+    str_cols = df.select_dtypes(include=['object', 'string']).columns
+
+    def clean_col(col):
+        return df[col].str.strip().str.replace('"', '', regex=False)
+
+    # Columns are independent, so wide/long files clean them on a thread pool;
+    # small files stay serial to skip the pool startup cost
+    if len(df) >= PARALLEL_CLEAN_MIN_ROWS and len(str_cols) > 1:
+        with ThreadPoolExecutor() as ex:
+            cleaned = dict(zip(str_cols, ex.map(clean_col, str_cols)))
+    else:
+        cleaned = {col: clean_col(col) for col in str_cols}
+    df = df.assign(**cleaned)
+
+    # Categoricals only need their categories cleaned; values that collapse together are merged
+    for col in df.select_dtypes(include='category').columns:
+        categories = df[col].cat.categories
+        if pd.api.types.is_string_dtype(categories):
+            cleaned_categories = categories.str.strip().str.replace('"', '', regex=False)
+            df[col] = df[col].map(dict(zip(categories, cleaned_categories))).astype('category')
+
+    # Headers that only matched the schema after cleaning still need converting
+    if not pd.api.types.is_numeric_dtype(df['MonthlyCostUSD']):
+        # On Arrow strings to_numeric leaves NaN values rather than nulls; float64 makes them missing again
+        df['MonthlyCostUSD'] = pd.to_numeric(df['MonthlyCostUSD'], errors='coerce').astype('float64')
+    for col, dtype in CSV_DTYPES.items():
+        if dtype == 'category' and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype('category')
+    return df
+
 if uploaded_file is not None:
-    df = pd.read_csv(uploaded_file, sep=",", engine="python")
+    df = load_df(uploaded_file.getvalue())
 else:
-    df = pd.read_csv("cloudmart_multi_account.csv", sep=",", engine="python")
-
-# Clean dataset
-df.columns = df.columns.str.strip().str.replace('"', '')
-for col in df.select_dtypes(include='object').columns:
-    df[col] = df[col].str.strip().str.replace('"', '')
-df['MonthlyCostUSD'] = pd.to_numeric(df['MonthlyCostUSD'], errors='coerce')
+    df = load_df("cloudmart_multi_account.csv")
 
 # -----------------------------
 # Sidebar Filters
@@ -45,28 +130,79 @@ projects = df['Project'].dropna().unique()
 selected_project = st.sidebar.multiselect("Project(s):", options=projects, default=projects)
 
 # Apply filters
+def category_mask(col, selected):
+    # Compare integer category codes; rows with a missing label never match
+    codes = df[col].cat.codes.to_numpy()
+    if len(selected) == len(df[col].cat.categories):
+        return codes >= 0
+    selected_codes = df[col].cat.categories.get_indexer(selected)
+    return np.isin(codes, selected_codes[selected_codes >= 0])
+
 filtered_df = df[
-    (df['Service'].isin(selected_service)) &
-    (df['Region'].isin(selected_region)) &
-    (df['Department'].isin(selected_department)) &
-    (df['Project'].isin(selected_project))
+    category_mask('Service', selected_service) &
+    category_mask('Region', selected_region) &
+    category_mask('Department', selected_department) &
+    category_mask('Project', selected_project)
 ]
 
-# -----------------------------
-# Create Tabs for Task Sets
-# -----------------------------
-tab1, tab2, tab3, tab4, tab5 = st.tabs([
-    "Task 1 – Data Exploration",
-    "Task 2 – Cost Visibility",
-    "Task 3 – Tagging Compliance",
-    "Task 4 – Visualization Dashboard",
-    "Task 5 – Tag Remediation Workflow/Reflection"
-])
+def arrow_groupby_sum(df, keys, value='MonthlyCostUSD', sort=True):
+    # Threaded Arrow hash aggregation; behaves like groupby(keys, as_index=False, observed=True)[value].sum()
+    keys = [keys] if isinstance(keys, str) else list(keys)
+    table = pa.Table.from_pandas(df[keys + [value]], preserve_index=False)
+    # float64 NaN becomes null in from_pandas and is skipped like skipna; min_count=0 makes an
+    # all-missing group sum to 0 as in pandas, not null
+    out = table.group_by(keys).aggregate([(value, 'sum', pc.ScalarAggregateOptions(min_count=0))]).to_pandas()
+    # Arrow keeps null keys as a group and categoricals keep every category; pandas drops both
+    out = out.rename(columns={f'{value}_sum': value}).dropna(subset=keys)
+    for key in keys:
+        if isinstance(out[key].dtype, pd.CategoricalDtype):
+            out[key] = out[key].cat.remove_unused_categories()
+    out = out[keys + [value]]
+    return out.sort_values(keys, ignore_index=True) if sort else out.reset_index(drop=True)
+
+@st.cache_data
+def compute_aggs(filtered_df):
+    # Cost reductions shared across the tabs, computed once per filter selection
+    is_untagged = filtered_df['Tagged'].eq('No').to_numpy()
+    untagged_df = filtered_df.iloc[np.flatnonzero(is_untagged)]
+    return dict(
+        untagged_df=untagged_df,
+        cost_by_tag=arrow_groupby_sum(filtered_df, 'Tagged'),
+        dept_untagged=arrow_groupby_sum(untagged_df, 'Department', sort=False),
+        project_cost=arrow_groupby_sum(filtered_df, 'Project', sort=False),
+        service_cost=arrow_groupby_sum(filtered_df, 'Service', sort=False),
+        env_cost=arrow_groupby_sum(filtered_df, 'Environment'),
+        env_tag_cost=arrow_groupby_sum(filtered_df, ['Environment','Tagged']).set_index(['Environment','Tagged'])['MonthlyCostUSD']
+            .unstack(fill_value=0).reindex(columns=['No', 'Yes'], fill_value=0),
+        dept_tag_cost=arrow_groupby_sum(filtered_df, ['Department','Tagged'], sort=False),
+    )
+
+def tag_presence(frame):
+    # Contiguous (rows x tag fields) bool matrix of which tags are filled in
+    return np.column_stack([frame[col].notna().to_numpy() for col in tag_fields])
+
+@st.cache_data
+def tag_scores(filtered_df):
+    # Number of tag fields present per resource
+    return tag_presence(filtered_df).sum(axis=1, dtype=np.int8)
+
+@st.cache_data
+def to_csv_bytes(df):
+    # Serialised only when the frame changes; PyArrow's writer encodes off the GIL
+    buf = io.BytesIO()
+    pacsv.write_csv(pa.Table.from_pandas(df, preserve_index=False), buf)
+    return buf.getvalue()
+
+aggs = compute_aggs(filtered_df)
+untagged_df = aggs['untagged_df']
+
+# Costs stay numeric; the $ formatting is applied at display time
+usd_format = "${:,.2f}"
 
 # -----------------------------
 # Task Set 1 – Data Exploration
 # -----------------------------
-with tab1:
+def render_tab1(filtered_df):
     st.header("Task Set 1 – Data Exploration")
     st.subheader("First 5 Rows of Dataset")
     st.dataframe(filtered_df.head())
@@ -87,69 +223,58 @@ with tab1:
 
     col1, col2, col3 = st.columns(3)
     col1.metric("Total Resources Count", len(filtered_df))
-    col2.metric("Total Tagged Resources", (filtered_df['Tagged']=='Yes').sum())
-    col3.metric("Total Untagged Resources", (filtered_df['Tagged']=='No').sum())
+    # One pass over the Tagged codes gives both counts
+    tag_status = filtered_df['Tagged'].value_counts(dropna=False)
+    col2.metric("Total Tagged Resources", int(tag_status.get('Yes', 0)))
+    col3.metric("Total Untagged Resources", int(tag_status.get('No', 0)))
 
     # Percent untagged
-    percent_untagged = (filtered_df['Tagged']=='No').mean() * 100
+    percent_untagged = tag_status.get('No', 0) / tag_status.sum() * 100
     st.write(f"Percentage of untagged resources: **{percent_untagged:.2f}%**")
 
 # -----------------------------
 # Task Set 2 – Cost Visibility
 # -----------------------------
-with tab2:
+def render_tab2(aggs):
     st.header("Task Set 2 – Cost Visibility")
 
     # Cost by Tagged
-    cost_by_tag = filtered_df.groupby('Tagged')['MonthlyCostUSD'].sum().reset_index()
-    cost_by_tag.columns = ["Tagged Status", "Total Cost (USD)"]
-
-    # Format the cost with $ and commas
-    cost_by_tag["Total Cost (USD)"] = cost_by_tag["Total Cost (USD)"].apply(lambda x: f"${x:,.2f}")
+    cost_by_tag = aggs['cost_by_tag'].rename(columns={'Tagged': "Tagged Status", 'MonthlyCostUSD': "Total Cost (USD)"})
 
     st.subheader("Total Cost by Tagging Status")
-    st.dataframe(cost_by_tag)
+    st.dataframe(cost_by_tag.style.format({"Total Cost (USD)": usd_format}))
     
     # Department with highest untagged cost
     st.subheader("Department with Highest Untagged Cost")
 
-    # Filter untagged resources
-    untagged_df = filtered_df[filtered_df['Tagged'] == 'No']
-
-    # Group by Department and sum cost
-    dept_untagged_cost = untagged_df.groupby('Department')['MonthlyCostUSD'].sum()
+    # Untagged cost summed per Department
+    dept_untagged_cost = aggs['dept_untagged']
 
     # Sort descending to get the department with highest untagged cost
-    dept_untagged_cost_sorted = dept_untagged_cost.sort_values(ascending=False).reset_index()
-    dept_untagged_cost_sorted.columns = ["Department", "Untagged Cost (USD)"]
-
-    # Format as cost
-    dept_untagged_cost_sorted["Untagged Cost (USD)"] = dept_untagged_cost_sorted["Untagged Cost (USD)"].apply(lambda x: f"${x:,.2f}")
+    dept_untagged_cost_sorted = dept_untagged_cost.sort_values('MonthlyCostUSD', ascending=False, ignore_index=True)
+    dept_untagged_cost_sorted = dept_untagged_cost_sorted.rename(columns={'MonthlyCostUSD': "Untagged Cost (USD)"})
 
     # Display the top department
-    st.table(dept_untagged_cost_sorted.head(1))
+    st.table(dept_untagged_cost_sorted.head(1).style.format({"Untagged Cost (USD)": usd_format}))
 
     # Project consuming highest cost
     st.subheader("Project Consuming Highest Cost Overall")
 
-    # Group by Project and sum cost
-    project_cost = filtered_df.groupby('Project')['MonthlyCostUSD'].sum()
+    # Total cost summed per Project
+    project_cost = aggs['project_cost']
 
     # Sort descending to get project with highest cost
-    project_cost_sorted = project_cost.sort_values(ascending=False).reset_index()
-    project_cost_sorted.columns = ["Project", "Total Cost (USD)"]
-
-    # Format as cost
-    project_cost_sorted["Total Cost (USD)"] = project_cost_sorted["Total Cost (USD)"].apply(lambda x: f"${x:,.2f}")
+    project_cost_sorted = project_cost.sort_values('MonthlyCostUSD', ascending=False, ignore_index=True)
+    project_cost_sorted = project_cost_sorted.rename(columns={'MonthlyCostUSD': "Total Cost (USD)"})
 
     # Display the top project
-    st.table(project_cost_sorted.head(1))
+    st.table(project_cost_sorted.head(1).style.format({"Total Cost (USD)": usd_format}))
 
     # Compare Prod vs Dev Environments
     st.subheader("Comparison of Prod vs Dev Environments: Cost & Tagging Quality")
 
-    # Group by Environment and Tagged
-    env_tag_cost = filtered_df.groupby(['Environment','Tagged'])['MonthlyCostUSD'].sum().unstack(fill_value=0)
+    # Cost per Environment split by Tagged
+    env_tag_cost = aggs['env_tag_cost']
 
     # Rename columns for clarity
     env_tag_cost = env_tag_cost.rename(columns={"Yes": "Tagged Cost (USD)", "No": "Untagged Cost (USD)"})
@@ -158,35 +283,38 @@ with tab2:
     env_tag_cost['Total Cost (USD)'] = env_tag_cost['Tagged Cost (USD)'] + env_tag_cost['Untagged Cost (USD)']
     env_tag_cost['% Untagged'] = (env_tag_cost['Untagged Cost (USD)'] / env_tag_cost['Total Cost (USD)'] * 100).round(2)
 
-    # Format cost columns
-    for col in ['Tagged Cost (USD)', 'Untagged Cost (USD)', 'Total Cost (USD)']:
-        env_tag_cost[col] = env_tag_cost[col].apply(lambda x: f"${x:,.2f}")
-
     # Reset index to show Environment as a column
     env_tag_cost = env_tag_cost.reset_index()
 
-    st.dataframe(env_tag_cost)
+    st.dataframe(env_tag_cost.style.format({
+        col: usd_format for col in ['Tagged Cost (USD)', 'Untagged Cost (USD)', 'Total Cost (USD)']
+    }))
 
 # -----------------------------
 # Task Set 3 – Tagging Compliance
 # -----------------------------
-with tab3:
+def render_tab3(filtered_df, untagged_df):
     st.header("Task Set 3 – Tagging Compliance")
     st.header("Tag Completeness Score Per Resource:")
-    tag_fields = ['Department','Project','Owner']
-    filtered_df['TagCompletenessScore'] = filtered_df[tag_fields].notnull().sum(axis=1)
+    # Scores are kept as arrays rather than written back into filtered_df
+    score = tag_scores(filtered_df)
     # Optionally, you can also compute % completeness
-    filtered_df['Tag Completeness %'] = (filtered_df['TagCompletenessScore'] / len(tag_fields) * 100).round(2)
+    completeness = (score * (100 / len(tag_fields))).round(2)
 
     # Show first 10 rows with score
-    st.dataframe(filtered_df[['AccountID', 'ResourceID', 'TagCompletenessScore', 'Tag Completeness %'] + tag_fields].head(10))
+    st.dataframe(filtered_df.head(10).assign(**{
+        'TagCompletenessScore': score[:10],
+        'Tag Completeness %': completeness[:10],
+    })[['AccountID', 'ResourceID', 'TagCompletenessScore', 'Tag Completeness %'] + tag_fields])
 
     st.subheader("Top 5 Resources with Lowest Tag Completeness Scores")
-    st.dataframe(filtered_df.nsmallest(5,'TagCompletenessScore')[['AccountID','ResourceID','TagCompletenessScore'] + tag_fields])
+    # O(N) selection; ranking on score then row position keeps nsmallest's first-occurrence tie-break
+    rank = score.astype(np.int64) * len(score) + np.arange(len(score))
+    lowest = np.argpartition(rank, 5)[:5] if len(rank) > 5 else np.arange(len(rank))
+    lowest = lowest[np.argsort(rank[lowest])]
+    st.dataframe(filtered_df.iloc[lowest].assign(TagCompletenessScore=score[lowest])[['AccountID','ResourceID','TagCompletenessScore'] + tag_fields])
 
     st.subheader("Most Frequently Missing Tag Fields")
-    # Define the tag fields to check
-    tag_fields = ['Department', 'Project', 'Owner']
 
     # Count missing values for each tag field
     missing_counts = filtered_df[tag_fields].isnull().sum().reset_index()
@@ -204,14 +332,11 @@ with tab3:
 
     st.subheader("Export Untagged Resources")
 
-    # Filter untagged resources
-    untagged_df = filtered_df[filtered_df['Tagged'] == 'No']
-
     # Show untagged resources table
     st.dataframe(untagged_df)
 
     # Create a CSV download button
-    csv = untagged_df.to_csv(index=False).encode('utf-8')
+    csv = to_csv_bytes(untagged_df)
     st.download_button(
         label="Download Untagged Resources as CSV",
         data=csv,
@@ -222,95 +347,117 @@ with tab3:
 # -----------------------------
 # Task Set 4 – Visualization Dashboard
 # -----------------------------
-with tab4:
+def render_tab4(filtered_df, aggs):
     st.header("Task Set 4 – Visualization Dashboard")
 
     # Pie chart: Tagged vs Untagged
-    tag_counts = filtered_df['Tagged'].value_counts()
-    fig1, ax1 = plt.subplots(figsize=(5, 5))
-    ax1.pie(tag_counts, labels=tag_counts.index, autopct='%1.1f%%', startangle=90, colors=['lightgreen','salmon'])
-    ax1.set_title("Tagged vs Untagged Resources")
-    st.pyplot(fig1)
+    tag_counts = filtered_df['Tagged'].value_counts().rename_axis('Tagged').reset_index(name='Resources')
+    tag_colors = alt.Scale(domain=['Yes', 'No'], range=['lightgreen', 'salmon'])
+    pie = alt.Chart(tag_counts).transform_joinaggregate(
+        Total='sum(Resources)'
+    ).transform_calculate(
+        Share='datum.Resources / datum.Total'
+    ).encode(
+        theta=alt.Theta('Resources:Q', stack=True),
+        color=alt.Color('Tagged:N', scale=tag_colors),
+        tooltip=['Tagged', 'Resources', alt.Tooltip('Share:Q', format='.1%')]
+    )
+    st.altair_chart(
+        alt.layer(
+            pie.mark_arc(outerRadius=120),
+            pie.mark_text(radius=145).encode(text=alt.Text('Share:Q', format='.1%')),
+            title="Tagged vs Untagged Resources"
+        ),
+        use_container_width=True
+    )
 
     # Horizontal bar chart: Total cost per Service
-    service_cost = filtered_df.groupby('Service')['MonthlyCostUSD'].sum().sort_values(ascending=True)
-    fig2, ax2 = plt.subplots(figsize=(8,6))
-    service_cost.plot(kind='barh', color='skyblue', ax=ax2)
-    ax2.set_xlabel("Total Cost (USD)")
-    ax2.set_ylabel("Service")
-    ax2.set_title("Total Cost per Service")
-    st.pyplot(fig2)
-
-    # Group by Department and Tagged, sum MonthlyCostUSD
-    dept_tag_cost = filtered_df.groupby(['Department','Tagged'])['MonthlyCostUSD'].sum().unstack(fill_value=0)
-
-    # Create a normal grouped bar chart
-    fig, ax = plt.subplots(figsize=(10,6))
-
-    # Get list of departments
-    departments = dept_tag_cost.index.tolist()
-    x = range(len(departments))
-    width = 0.35  # width of bars
-
-    # Plot bars for Tagged and Untagged
-    ax.bar([i - width/2 for i in x], dept_tag_cost['Yes'], width=width, label='Tagged', color='lightgreen')
-    ax.bar([i + width/2 for i in x], dept_tag_cost['No'], width=width, label='Untagged', color='salmon')
-
-    # Labels and title
-    ax.set_xticks(x)
-    ax.set_xticklabels(departments, rotation=45, ha='right')
-    ax.set_ylabel("Total Cost (USD)")
-    ax.set_title("Cost per Department by Tagging Status")
-    ax.legend()
-
-    # Add values on top of bars
-    for i in x:
-        ax.text(i - width/2, dept_tag_cost['Yes'][i] + 5, f"${dept_tag_cost['Yes'][i]:,.0f}", ha='center', fontweight='bold', fontsize=9)
-        ax.text(i + width/2, dept_tag_cost['No'][i] + 5, f"${dept_tag_cost['No'][i]:,.0f}", ha='center', fontweight='bold', fontsize=9)
-    st.pyplot(fig)
+    service_cost = aggs['service_cost']
+    st.altair_chart(alt.Chart(service_cost, title="Total Cost per Service").mark_bar(color='skyblue').encode(
+        x=alt.X('MonthlyCostUSD:Q', title="Total Cost (USD)"),
+        y=alt.Y('Service:N', title="Service", sort='-x'),
+        tooltip=['Service', alt.Tooltip('MonthlyCostUSD:Q', format='$,.2f')]
+    ), use_container_width=True)
+
+    # Cost per Department split by Tagged
+    dept_tag_cost = aggs['dept_tag_cost']
+
+    # Grouped bar chart with the cost labelled on top of each bar
+    dept_bars = alt.Chart(dept_tag_cost).encode(
+        x=alt.X('Department:N', title=None, axis=alt.Axis(labelAngle=-45)),
+        xOffset=alt.XOffset('Tagged:N', sort=['Yes', 'No']),
+        y=alt.Y('MonthlyCostUSD:Q', title="Total Cost (USD)"),
+        color=alt.Color('Tagged:N', scale=tag_colors, title=None,
+                        legend=alt.Legend(labelExpr="datum.label == 'Yes' ? 'Tagged' : 'Untagged'")),
+    )
+    st.altair_chart(
+        alt.layer(
+            dept_bars.mark_bar(),
+            dept_bars.mark_text(dy=-6, fontWeight='bold', fontSize=9).encode(
+                text=alt.Text('MonthlyCostUSD:Q', format='$,.0f'), color=alt.value('black')
+            ),
+            title="Cost per Department by Tagging Status"
+        ),
+        use_container_width=True
+    )
 
     # Compare Prod vs Dev environment
     # env_tag_cost = filtered_df.groupby(['Environment','Tagged'])['MonthlyCostUSD'].sum().unstack(fill_value=0)
     # st.subheader("Prod vs Dev Environment Cost & Tagging")
     # st.dataframe(env_tag_cost)
 
-    # Group by Environment and sum costs
-    env_cost = filtered_df.groupby('Environment')['MonthlyCostUSD'].sum().reset_index()
-    # Format costs for display
-    env_cost['MonthlyCostUSD_formatted'] = env_cost['MonthlyCostUSD'].apply(lambda x: f"${x:,.2f}")
+    # Total cost per Environment
+    env_cost = aggs['env_cost']
 
     # Create bar chart
-    fig, ax = plt.subplots(figsize=(8,5))
-    ax.bar(env_cost['Environment'], env_cost['MonthlyCostUSD'], color=['lightblue', 'orange', 'green'])
-    ax.set_ylabel("Total Cost (USD)")
-    ax.set_xlabel("Environment")
-    ax.set_title("Total Cost by Environment")
-    for i, v in enumerate(env_cost['MonthlyCostUSD']):
-        ax.text(i, v + max(env_cost['MonthlyCostUSD'])*0.01, f"${v:,.0f}", ha='center', fontweight='bold')
-    st.pyplot(fig)
+    env_bars = alt.Chart(env_cost).encode(
+        x=alt.X('Environment:N', title="Environment", axis=alt.Axis(labelAngle=0)),
+        y=alt.Y('MonthlyCostUSD:Q', title="Total Cost (USD)"),
+    )
+    st.altair_chart(
+        alt.layer(
+            env_bars.mark_bar().encode(
+                color=alt.Color('Environment:N', scale=alt.Scale(range=['lightblue', 'orange', 'green']), legend=None)
+            ),
+            env_bars.mark_text(dy=-6, fontWeight='bold').encode(text=alt.Text('MonthlyCostUSD:Q', format='$,.0f')),
+            title="Total Cost by Environment"
+        ),
+        use_container_width=True
+    )
 
 # -----------------------------
 # Task Set 5 – Tag Remediation Workflow
 # -----------------------------
-with tab5:
+def render_tab5(df, untagged_df, aggs):
     st.header("Task Set 5 – Tag Remediation Workflow")
 
     st.subheader("Edit Missing Tags for Untagged Resources")
+    # Edited as plain strings so new departments/projects can be typed, not just picked
     edited_tags = st.data_editor(
-        untagged_df[tag_fields],
+        untagged_df[tag_fields].astype('string'),
         num_rows="dynamic",
         use_container_width=True
     )
-    untagged_df[tag_fields] = edited_tags
-    df.update(untagged_df)
-    df.loc[df[tag_fields].notnull().all(axis=1), 'Tagged'] = 'Yes'
+    # Write the edits back into the tag columns only; rows added in the editor have no match in df
+    edited_tags = edited_tags[edited_tags.index.isin(df.index)]
+    touched = edited_tags.index
+    # Categorical tag columns need any newly typed values registered before the write
+    for col in tag_fields:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            new_values = pd.Index(edited_tags[col].dropna().unique()).difference(df[col].cat.categories)
+            if len(new_values):
+                df[col] = df[col].cat.add_categories(new_values)
+    if 'Yes' not in df['Tagged'].cat.categories:
+        df['Tagged'] = df['Tagged'].cat.add_categories(['Yes'])
+    df.loc[touched, tag_fields] = edited_tags.to_numpy()
+    df.loc[touched[tag_presence(edited_tags).all(axis=1)], 'Tagged'] = 'Yes'
 
     st.subheader("Updated Dataset After Remediation")
     st.dataframe(df, use_container_width=True)
 
     st.download_button(
         label="Download Updated Dataset",
-        data=df.to_csv(index=False).encode('utf-8'),
+        data=to_csv_bytes(df),
         file_name='cloudmart_updated_dataset.csv',
         mime='text/csv'
     )
@@ -318,31 +465,31 @@ with tab5:
     st.subheader("Compare Cost Visibility: Before vs After Remediation")
 
     # 1️⃣ Original cost visibility (before remediation)
-    original_cost_by_tag = df.groupby('Tagged')['MonthlyCostUSD'].sum().reset_index()
-    original_cost_by_tag.columns = ["Tagged Status", "Total Cost Before ($)"]
-    original_cost_by_tag["Total Cost Before ($)"] = original_cost_by_tag["Total Cost Before ($)"].apply(lambda x: f"${x:,.2f}")
+    original_cost_by_tag = arrow_groupby_sum(df, 'Tagged')
+    original_cost_by_tag = original_cost_by_tag.rename(columns={'Tagged': "Tagged Status", 'MonthlyCostUSD': "Total Cost Before ($)"})
 
     # 2️⃣ Updated cost visibility (after remediation)
-    updated_cost_by_tag = filtered_df.groupby('Tagged')['MonthlyCostUSD'].sum().reset_index()
-    updated_cost_by_tag.columns = ["Tagged Status", "Total Cost After ($)"]
-    updated_cost_by_tag["Total Cost After ($)"] = updated_cost_by_tag["Total Cost After ($)"].apply(lambda x: f"${x:,.2f}")
+    updated_cost_by_tag = aggs['cost_by_tag'].rename(columns={'Tagged': "Tagged Status", 'MonthlyCostUSD': "Total Cost After ($)"})
 
     # 3️⃣ Merge the two for comparison
     cost_comparison = pd.merge(original_cost_by_tag, updated_cost_by_tag, on="Tagged Status")
-    st.dataframe(cost_comparison)
+    st.dataframe(cost_comparison.style.format({
+        "Total Cost Before ($)": usd_format,
+        "Total Cost After ($)": usd_format,
+    }))
 
     # Optional: display a bar chart for visual comparison
     fig, ax = plt.subplots(figsize=(6,4))
-    ax.bar(cost_comparison['Tagged Status'], 
-        [float(cost.replace('$','').replace(',','')) for cost in cost_comparison['Total Cost Before ($)']], 
+    ax.bar(cost_comparison['Tagged Status'], cost_comparison['Total Cost Before ($)'],
         width=0.4, label='Before', align='edge', color='salmon')
-    ax.bar([i for i in range(len(cost_comparison))], 
-        [float(cost.replace('$','').replace(',','')) for cost in cost_comparison['Total Cost After ($)']], 
+    ax.bar(range(len(cost_comparison)), cost_comparison['Total Cost After ($)'],
         width=-0.4, label='After', align='edge', color='lightgreen')
     ax.set_ylabel("Total Cost ($)")
     ax.set_title("Cost Visibility Before vs After Remediation")
     ax.legend()
     st.pyplot(fig)
+    # Release the figure so pyplot's registry doesn't grow with every rerun
+    plt.close(fig)
 
     st.subheader("Short Reflection:")
 
@@ -366,4 +513,28 @@ with tab5:
             - Standardize tagging policies
             - Enforce tagging at the time of resource creation
             - Integrate cost and tag reporting
-    """)
\ No newline at end of file
+    """)
+
+# -----------------------------
+# Create Tabs for Task Sets
+# -----------------------------
+# Streamlit runs every tab on each rerun; the cached helpers above make the
+# hidden tabs cheap when the filters haven't changed
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    "Task 1 – Data Exploration",
+    "Task 2 – Cost Visibility",
+    "Task 3 – Tagging Compliance",
+    "Task 4 – Visualization Dashboard",
+    "Task 5 – Tag Remediation Workflow/Reflection"
+])
+
+with tab1:
+    render_tab1(filtered_df)
+with tab2:
+    render_tab2(aggs)
+with tab3:
+    render_tab3(filtered_df, untagged_df)
+with tab4:
+    render_tab4(filtered_df, aggs)
+with tab5:
+    render_tab5(df, untagged_df, aggs)